@@ -24,26 +24,63 @@
 from Shared_Components import *
 import random
 import math
+import multiprocessing
+from array import array
+from bisect import bisect_left
+from heapq import nlargest
 
 SAFE_EPSILON = 0.000001
 
 class AntColony:
     def __init__(self, tasks, n_ants=8, n_iterations=18,
-                 decay=0.1, alpha=1, beta=2):
+                 decay=0.1, alpha=1, beta=2, n_workers=1,
+                 n_candidates=None, seed=None):
 
         self.tasks = tasks
         self.n = len(tasks)
+        self.n_candidates = n_candidates  # None = every feasible successor
+
+        # Task fields as flat lists (one per field), shared by every
+        # loop below so none of them go through Task attributes
+        self.starts = [t.start for t in tasks]
+        self.ends = [t.end for t in tasks]
+        self.priorities = [t.priority for t in tasks]
 
         self.distances = self._build_distance_matrix()
-        self.pheromone = [[1.0 for _ in range(self.n)] for _ in range(self.n)]
+        self.succ_ptr, self.succ_idx, self.heuristic = self._build_successors()
+
+        # Per-task row lists over the same slots. Tours walk whole rows,
+        # and reading a prebuilt row is cheaper than slicing the flat
+        # list on every ant step. A dense n x n table would not help:
+        # about half of all pairs overlap and are never candidates.
+        self.succ_rows = _split_rows(self.succ_idx, self.succ_ptr)
+
+        # One pheromone value per successor slot (see _build_successors);
+        # overlapping transitions are never walked so they need no entry
+        self.pheromone = [1.0] * len(self.succ_idx)
 
         self.n_ants = n_ants
         self.n_iterations = n_iterations
+        self.n_workers = n_workers  # > 1 builds tours in worker processes
+
+        # Own RNG instead of the module-level one: seedable per colony,
+        # and no shared global state when ants run in other processes
+        self.rng = random.Random(seed)
 
         self.decay = decay      # pheromone evaporation
         self.alpha = alpha      # pheromone importance
         self.beta = beta        # heuristic importance
 
+        # heuristic^β never changes, pheromone^α only changes between
+        # iterations, so ants read a per-iteration score table
+        if beta == 2:   # default: a multiply instead of a pow call
+            self.heuristic_pow = [h * h for h in self.heuristic]
+        else:
+            self.heuristic_pow = [h ** beta for h in self.heuristic]
+        self.scores = None
+        self.score_rows = None
+        self._update_scores()
+
     # -----------------------------------------------------------
     # Distance Matrix
     # - overlap gives huge penalty
@@ -53,39 +90,106 @@ class AntColony:
     # interpretation: LOWER = better transition
     # -----------------------------------------------------------
     def _build_distance_matrix(self):
-        n = len(self.tasks)
-        M = [[0]*n for _ in range(n)]
-
+        n = self.n
+        starts = self.starts
+        ends = self.ends
+        priorities = self.priorities
+
+        # Rows are float32 arrays: the matrix is only read while building
+        # the successor lists, and single precision is plenty for
+        # time gaps, at a fraction of the memory of boxed floats
+        blank_row = array("f", [float("inf")]) * n
+        M = [array("f", blank_row) for _ in range(n)]
+
+        # Overlap and the weight term are symmetric, so each unordered
+        # pair is only examined once; only the gap depends on direction
         for i in range(n):
-            A = self.tasks[i]
-
-            for j in range(n):
-                if i == j:
-                    M[i][j] = float("inf")
-                    continue
+            a_start = starts[i]
+            a_end = ends[i]
+            a_priority = priorities[i]
+            row_i = M[i]
 
-                B = self.tasks[j]
+            for j in range(i + 1, n):
+                b_start = starts[j]
+                b_end = ends[j]
 
                 # Overlap penalty (huge)
-                overlap = max(0, min(A.end, B.end) - max(A.start, B.start))
-                if overlap > 0:
-                    M[i][j] = 1e8  # don't allow transitions into overlaps
+                # don't allow transitions into overlaps
+                if ((a_end if a_end < b_end else b_end) >
+                        (a_start if a_start > b_start else b_start)):
+                    row_i[j] = 1e8
+                    M[j][i] = 1e8
                     continue
 
+                # Weight helps reduce distance (slightly)
+                avg_weight = (a_priority + priorities[j]) / 2
+                bonus = 1 / (avg_weight + 1)
+
                 # Legit transition → small time gap penalty
-                gap = max(0, B.start - A.end)
+                gap = b_start - a_end
+                dist = (gap if gap > 0 else 0) + bonus
+                row_i[j] = dist if dist > 0 else SAFE_EPSILON
 
-                # Weight helps reduce distance (slightly)
-                avg_weight = (A.priority + B.priority) / 2
+                gap = a_start - b_end
+                dist = (gap if gap > 0 else 0) + bonus
+                M[j][i] = dist if dist > 0 else SAFE_EPSILON
 
-                dist = gap + (1 / (avg_weight + 1))
+        return M
 
-                if dist <= 0:
-                    dist = SAFE_EPSILON
+    # -----------------------------------------------------------
+    # Successor lists (compressed sparse rows)
+    # For every task, the tasks an ant may move to next (no overlap)
+    # and the matching heuristic value. Both only depend on the tasks,
+    # so they are computed once here instead of on every ant step.
+    #
+    # The successors of task i are succ_idx[succ_ptr[i]:succ_ptr[i+1]]
+    # (ascending), and every per-edge value (heuristic, pheromone,
+    # score) lives in a flat list at the same slot.
+    #
+    # With n_candidates set, each task only keeps that many successors
+    # (the ones with the best heuristic), a standard ACO candidate list.
+    #
+    # heuristic = (priority / duration) / distance
+    # -----------------------------------------------------------
+    def _build_successors(self):
+        limit = self.n_candidates
 
-                M[i][j] = dist
+        durations = [max(e - s, SAFE_EPSILON)
+                     for s, e in zip(self.starts, self.ends)]
+        value = [p / d for p, d in zip(self.priorities, durations)]
 
-        return M
+        succ_ptr = [0]
+        succ_idx = []
+        heuristic = []
+
+        for row in self.distances:
+            j_row = []
+            h_row = []
+
+            for j, dist in enumerate(row):
+                if dist >= 1e7:   # impossible overlap transition (or self)
+                    continue
+
+                h = value[j] / dist
+                if h <= 0:
+                    h = SAFE_EPSILON
+
+                j_row.append(j)
+                h_row.append(h)
+
+            if limit is not None and len(j_row) > limit:
+                # Partial selection instead of sorting the whole row;
+                # positions are re-sorted so the row stays ascending
+                keep = sorted(nlargest(limit, range(len(h_row)),
+                                       key=h_row.__getitem__))
+                j_row = [j_row[k] for k in keep]
+                h_row = [h_row[k] for k in keep]
+
+            succ_idx.extend(j_row)
+            heuristic.extend(h_row)
+            succ_ptr.append(len(succ_idx))
+
+        return succ_ptr, succ_idx, heuristic
 
     # -----------------------------------------------------------
     # Run ACO
@@ -94,134 +198,226 @@ class AntColony:
         best_weight = -1
         best_path = None
 
-        for iteration in range(self.n_iterations):
-            paths = self._construct_all_paths()
-            self._evaporate_pheromones()
-            self._reinforce_pheromones(paths)
+        pool = self._start_workers() if self.n_workers > 1 else None
+
+        try:
+            for iteration in range(self.n_iterations):
+                paths = self._construct_all_paths(pool)
+                self._evaporate_pheromones()
+                self._reinforce_pheromones(paths)
+                self._update_scores()
 
-            for path_weight, path in paths:
-                if path_weight > best_weight:
-                    best_weight = path_weight
-                    best_path = path
+                for path_weight, path in paths:
+                    if path_weight > best_weight:
+                        best_weight = path_weight
+                        best_path = path
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
         final_schedule = self._build_final_schedule(best_path)
         return final_schedule, best_weight
 
+    # -----------------------------------------------------------
+    # Parallel ants
+    # Workers get the static successor lists once, and read the
+    # per-iteration scores from shared memory, so each batch of tours
+    # only costs a few seeds in and one path out per ant.
+    # -----------------------------------------------------------
+    def _start_workers(self):
+        self.shared_scores = multiprocessing.Array("d", len(self.scores),
+                                                   lock=False)
+        return multiprocessing.Pool(
+            self.n_workers,
+            initializer=_init_worker,
+            initargs=(self.n, self.succ_ptr, self.succ_rows,
+                      self.priorities, self.shared_scores),
+        )
+
     # -----------------------------------------------------------
     # Build paths for all ants
     # -----------------------------------------------------------
-    def _construct_all_paths(self):
+    def _construct_all_paths(self, pool=None):
+        if pool is not None:
+            self.shared_scores[:] = self.scores
+            # Seeds come from the colony RNG so a seeded run is repeatable
+            seeds = [self.rng.getrandbits(32) for _ in range(self.n_ants)]
+            # One batch per worker so each rebuilds its score rows once
+            batches = [seeds[k::self.n_workers]
+                       for k in range(self.n_workers)]
+            done = pool.map(_worker_tours, batches)
+
+            results = [None] * self.n_ants
+            for k, batch in enumerate(done):
+                results[k::self.n_workers] = batch
+            return results
+
+        priorities = self.priorities
+        used = [False] * self.n
         results = []
         for _ in range(self.n_ants):
-            path = self._generate_path()
-            weight = sum(self.tasks[i].priority for i in path)
+            path = _build_tour(self.n, self.succ_rows, self.score_rows,
+                               self.rng, used)
+            weight = sum(priorities[i] for i in path)
             results.append((weight, path))
         return results
 
     # -----------------------------------------------------------
-    # Generate one ant's path
-    # -----------------------------------------------------------
-    def _generate_path(self):
-        start = random.randint(0, self.n - 1)
-        used = {start}
-        path = [start]
-
-        while True:
-            nxt = self._select_next(path[-1], used)
-            if nxt is None:
-                break
-            used.add(nxt)
-            path.append(nxt)
-
-        return path
-
-    # -----------------------------------------------------------
-    # Select next job via probability:
+    # Transition scores:
     #   (pheromone^α) * (heuristic^β)
     #
-    # heuristic = (priority / (distance + duration))
-    #
+    # Rebuilt once per iteration, one value per successor slot.
     # -----------------------------------------------------------
-    def _select_next(self, current, used):
-        candidates = []
-
-        for j in range(self.n):
-            if j in used:
-                continue
-
-            dist = self.distances[current][j]
-            if dist >= 1e7:   # impossible overlap transition
-                continue
-
-            B = self.tasks[j]
-            duration = max(B.end - B.start, SAFE_EPSILON)
-
-            pher = self.pheromone[current][j] ** self.alpha
-            heuristic = (B.priority / duration) / dist
-
-            if heuristic <= 0:
-                heuristic = SAFE_EPSILON
-
-            score = pher * (heuristic ** self.beta)
-            candidates.append((j, score))
-
-        if not candidates:
-            return None
-
-        # Roulette Wheel Selection
-        total = sum(s for _, s in candidates)
-        r = random.random() * total
-        running = 0
-
-        for j, score in candidates:
-            running += score
-            if running >= r:
-                return j
-
-        return candidates[-1][0]
+    def _update_scores(self):
+        alpha = self.alpha
+        if alpha == 1:
+            # Default setting: pheromone^1 is the pheromone itself
+            self.scores = [p * hp for p, hp in
+                           zip(self.pheromone, self.heuristic_pow)]
+        else:
+            self.scores = [(p ** alpha) * hp for p, hp in
+                           zip(self.pheromone, self.heuristic_pow)]
+        self.score_rows = _split_rows(self.scores, self.succ_ptr)
 
     # -----------------------------------------------------------
     # Pheromone Update
     # Ants with HIGH TOTAL WEIGHT deposit more pheromone
     # -----------------------------------------------------------
     def _reinforce_pheromones(self, paths):
+        succ_ptr = self.succ_ptr
+        succ_idx = self.succ_idx
+        pheromone = self.pheromone
+
         for weight, path in paths:
             if weight <= 0:
                 continue
 
             deposit = weight ** 1.3  # reward exponential growth
 
-            for i in range(len(path) - 1):
-                a = path[i]
-                b = path[i+1]
-                self.pheromone[a][b] += deposit
+            for a, b in zip(path, path[1:]):
+                # Rows are sorted, so the edge's slot is a binary search
+                # instead of a scan of the row. Tours only ever step along
+                # successor rows, where feasibility was settled once in
+                # _build_successors, so the edge is always there; the
+                # check is kept for debug runs only (dropped under -O).
+                slot = bisect_left(succ_idx, b, succ_ptr[a], succ_ptr[a + 1])
+                assert succ_idx[slot] == b, (a, b)
+                pheromone[slot] += deposit
 
+    # -----------------------------------------------------------
+    # Evaporate and floor at SAFE_EPSILON in one pass over the table
     # -----------------------------------------------------------
     def _evaporate_pheromones(self):
-        for i in range(self.n):
-            for j in range(self.n):
-                self.pheromone[i][j] *= (1 - self.decay)
-                if self.pheromone[i][j] < SAFE_EPSILON:
-                    self.pheromone[i][j] = SAFE_EPSILON
+        keep = 1 - self.decay
+        self.pheromone = [v if (v := p * keep) >= SAFE_EPSILON
+                          else SAFE_EPSILON
+                          for p in self.pheromone]
 
     # -----------------------------------------------------------
     # Build final non-overlapping schedule from the best path
     # -----------------------------------------------------------
     def _build_final_schedule(self, path):
-        tasks_sorted = sorted([self.tasks[i] for i in path],
-                              key=lambda t: t.start)
+        starts = self.starts
+        ends = self.ends
 
         schedule = []
         current_end = -1
 
-        for t in tasks_sorted:
-            if t.start >= current_end:
-                schedule.append(t)
-                current_end = t.end
+        for i in sorted(path, key=starts.__getitem__):
+            if starts[i] >= current_end:
+                schedule.append(self.tasks[i])
+                current_end = ends[i]
 
         return schedule
 
 
+# -----------------------------------------------------------
+# Cut a flat per-slot list into one list per task
+# -----------------------------------------------------------
+def _split_rows(flat, succ_ptr):
+    return [flat[lo:hi] for lo, hi in zip(succ_ptr, succ_ptr[1:])]
+
+# -----------------------------------------------------------
+# Tour construction
+# Kept at module level so worker processes can run it too.
+# `rng` is a random.Random; its random() method is looked up once
+# and handed down as a plain function. `used` is a caller-owned
+# all-False buffer of length n, shared by every ant of a batch.
+# -----------------------------------------------------------
+def _build_tour(n, succ_rows, score_rows, rng, used):
+    rand = rng.random
+    start = rng.randint(0, n - 1)
+    used[start] = True
+    path = [start]
+
+    while True:
+        nxt = _select_next(path[-1], used, succ_rows, score_rows, rand)
+        if nxt is None:
+            break
+        used[nxt] = True
+        path.append(nxt)
+
+    # Hand the buffer back all-False for the next ant
+    for i in path:
+        used[i] = False
+
+    return path
+
+# -----------------------------------------------------------
+# Select next job via probability proportional to its score
+#
+# Only the precomputed successors of the current task are scanned,
+# so overlapping transitions never reach this loop.
+# -----------------------------------------------------------
+def _select_next(current, used, succ_rows, score_rows, rand):
+    cand_j = []
+    cumulative = []     # running score total up to each candidate
+    total = 0
+
+    for j, score in zip(succ_rows[current], score_rows[current]):
+        if used[j]:
+            continue
+
+        total += score
+        cand_j.append(j)
+        cumulative.append(total)
+
+    if not cand_j:
+        return None
+
+    # Roulette Wheel Selection: binary search on the running totals
+    # for the first candidate whose cumulative score reaches r
+    r = rand() * total
+    k = bisect_left(cumulative, r)
+
+    return cand_j[k] if k < len(cand_j) else cand_j[-1]
+
+# -----------------------------------------------------------
+# Worker process side of the parallel ants
+# -----------------------------------------------------------
+_worker = {}
+
+def _init_worker(n, succ_ptr, succ_rows, priorities, shared_scores):
+    _worker["n"] = n
+    _worker["succ_ptr"] = succ_ptr
+    _worker["succ_rows"] = succ_rows
+    _worker["priorities"] = priorities
+    _worker["scores"] = shared_scores
+
+def _worker_tours(seeds):
+    score_rows = _split_rows(_worker["scores"][:], _worker["succ_ptr"])
+    priorities = _worker["priorities"]
+    used = [False] * _worker["n"]
+
+    results = []
+    for seed in seeds:
+        path = _build_tour(_worker["n"], _worker["succ_rows"], score_rows,
+                           random.Random(seed), used)
+        results.append((sum(priorities[i] for i in path), path))
+    return results
+
+
 def run_ant_colony(tasks):
     print("\n🐜 Running Improved Ant Colony Optimization...")
     colony = AntColony(tasks)
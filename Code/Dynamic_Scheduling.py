@@ -22,35 +22,75 @@
 # ------------------------------------
 
 from Shared_Components import *
+from bisect import bisect_right
 
 class DynamicScheduler:
     def __init__(self):
+        # active_tasks is kept in scheduling order: highest weight first,
+        # then earliest finish time. _keys holds the matching sort keys.
         self.active_tasks = []
+        self._keys = []
         self.schedule = []
+
+        # State of the reschedule scan just before position k of
+        # active_tasks: the end of the last scheduled task and how many
+        # tasks were scheduled so far. Entry len(active_tasks) is the
+        # final state. Lets reschedule resume from the first change.
+        self._end_before = [-1]
+        self._count_before = [0]
         self.current_time = 0
 
     def add_task(self, task):
         print(f"[Time {self.current_time}] Adding task {task.name}")
-        self.active_tasks.append(task)
-        self.reschedule()
+        # Insert in order instead of re-sorting everything on every add;
+        # bisect_right keeps ties in arrival order like a stable sort
+        key = (-task.priority, task.end)
+        pos = bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self.active_tasks.insert(pos, task)
+        # Tasks ahead of the new one are unaffected
+        self.reschedule(pos)
 
     def remove_task(self, task_name):
         print(f"[Time {self.current_time}] Removing task {task_name}")
-        self.active_tasks = [t for t in self.active_tasks if t.name != task_name]
-        self.reschedule()
+        kept = [i for i, t in enumerate(self.active_tasks)
+                if t.name != task_name]
+
+        # The scan only changes from the first removed task onwards
+        first = len(kept)
+        for k, i in enumerate(kept):
+            if k != i:
+                first = k
+                break
+
+        self.active_tasks = [self.active_tasks[i] for i in kept]
+        self._keys = [self._keys[i] for i in kept]
+        self.reschedule(first)
+
+    def reschedule(self, start=0):
+        # active_tasks is already ordered by weight, then finish time.
+        # Everything before `start` is unchanged, so pick the scan up
+        # from the state saved at that position.
+        end_before = self._end_before
+        count_before = self._count_before
 
-    def reschedule(self):
-        # Sort by weight, then earliest finish time
-        tasks_sorted = sorted(self.active_tasks,
-                              key=lambda t: (-t.priority, t.end))
+        current_end = end_before[start]
+        count = count_before[start]
+        new_schedule = self.schedule[:count]
+        del end_before[start + 1:]
+        del count_before[start + 1:]
 
-        new_schedule = []
-        current_end = -1
+        schedule_append = new_schedule.append
+        end_append = end_before.append
+        count_append = count_before.append
 
-        for task in tasks_sorted:
+        for task in self.active_tasks[start:]:
             if task.start >= current_end:
-                new_schedule.append(task)
+                schedule_append(task)
                 current_end = task.end
+                count += 1
+            end_append(current_end)
+            count_append(count)
 
         self.schedule = new_schedule
         print(f"[Time {self.current_time}] New Schedule: {new_schedule}\n")
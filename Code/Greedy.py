@@ -24,16 +24,28 @@
 from Shared_Components import *
 
 def greedy_schedule(tasks):
+    # Work on flat per-field lists instead of Task attributes
+    starts = [t.start for t in tasks]
+    ends = [t.end for t in tasks]
+    neg_priorities = [-t.priority for t in tasks]
+
     # Sort by: 1) highest weight (priority), 2) earliest end time
-    tasks_sorted = sorted(tasks, key=lambda t: (-t.priority, t.end))
+    # Two stable sorts on plain keys (secondary first) avoid building
+    # and comparing a tuple per task
+    order = sorted(range(len(tasks)), key=ends.__getitem__)
+    order.sort(key=neg_priorities.__getitem__)
 
     schedule = []
     current_end = -1
-
-    for task in tasks_sorted:
-        if task.start >= current_end:
-            schedule.append(task)
-            current_end = task.end
+    latest_start = max(starts, default=0)
+
+    for i in order:
+        if starts[i] >= current_end:
+            schedule.append(tasks[i])
+            current_end = ends[i]
+            # Nothing left can start after this point
+            if current_end > latest_start:
+                break
 
     return schedule
 